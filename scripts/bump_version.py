@@ -5,11 +5,14 @@ Follows semantic versioning and creates tagged commits.
 """
 
 import argparse
+import copy
+import functools
 import re
+import shlex
 import subprocess
 import sys
 from pathlib import Path
-from typing import Tuple
+from typing import List, Optional, Tuple, Union
 
 try:
     import tomllib  # Python 3.11+
@@ -17,6 +20,41 @@ except ImportError:
     import tomli as tomllib  # fallback for older Python
 
 
+@functools.lru_cache(maxsize=8)
+def _load_pyproject(path: str, mtime_ns: int, size: int) -> dict:
+    """Load and parse pyproject.toml, memoized on (path, mtime_ns, size)."""
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def load_pyproject(path: Path) -> dict:
+    """Return parsed pyproject.toml, re-reading only if the file changed.
+
+    A copy is returned so callers cannot mutate the cached data.
+    """
+    st = path.stat()
+    return copy.deepcopy(_load_pyproject(str(path), st.st_mtime_ns, st.st_size))
+
+
+_VERSION_RE = re.compile(r"^(\d+)\.(\d+)\.(\d+)(?:-.*)?$")
+
+# `version = ...` key line, capturing indentation and any trailing comment
+_VERSION_LINE_RE = re.compile(
+    r"""^(\s*)version\s*=\s*(?:"[^"]*"|'[^']*'|[^\s#]*)(\s*#.*)?\s*$"""
+)
+
+# Table header, e.g. `[project]` or `  [[tool.x]]  # comment`
+_TABLE_HEADER_RE = re.compile(r"^\s*\[\[?\s*([^\]]+?)\s*\]\]?\s*(?:#.*)?$")
+
+
+def _project_version(content: str) -> Optional[str]:
+    """Return project.version from TOML text, or None if it cannot be read."""
+    try:
+        return tomllib.loads(content)["project"]["version"]
+    except (tomllib.TOMLDecodeError, KeyError, TypeError):
+        return None
+
+
 class VersionBumper:
     def __init__(self, pyproject_path: Path = None):
         self.pyproject_path = pyproject_path or Path("pyproject.toml")
@@ -25,20 +63,19 @@ class VersionBumper:
 
     def get_current_version(self) -> str:
         """Get the current version from pyproject.toml."""
-        with open(self.pyproject_path, "rb") as f:
-            data = tomllib.load(f)
+        data = load_pyproject(self.pyproject_path)
         return data["project"]["version"]
 
     def parse_version(self, version: str) -> Tuple[int, int, int]:
         """Parse semantic version string into components."""
-        match = re.match(r"^(\d+)\.(\d+)\.(\d+)(?:-.*)?$", version)
+        match = _VERSION_RE.match(version)
         if not match:
             raise ValueError(f"Invalid version format: {version}")
         return tuple(map(int, match.groups()))
 
-    def bump_version(self, bump_type: str) -> str:
+    def bump_version(self, bump_type: str, current: Optional[str] = None) -> str:
         """Bump version based on type (major, minor, patch)."""
-        current = self.get_current_version()
+        current = current or self.get_current_version()
         major, minor, patch = self.parse_version(current)
 
         if bump_type == "major":
@@ -59,83 +96,113 @@ class VersionBumper:
             print(f"✅ Version is already {new_version}")
             return
 
-        # Read current content
-        content = self.pyproject_path.read_text()
-
-        # Replace version line - handle both quoted and unquoted values
-        patterns = [
-            r'^version = "[^"]*"',  # version = "0.0.1"
-            r"^version = '[^']*'",  # version = '0.0.1'
-            r'^version = [^\s#]*',  # version = 0.0.1 (unquoted)
-        ]
-
-        replacement = f'version = "{new_version}"'
-        new_content = content
-
-        for pattern in patterns:
-            new_content = re.sub(pattern, replacement, new_content, flags=re.MULTILINE)
-            if new_content != content:
+        # Read current content, keeping the file's own line endings
+        with open(self.pyproject_path, newline="") as f:
+            content = f.read()
+
+        # Single pass over the lines: replace the first `version =` line in
+        # [project] that tomllib confirms is the real project.version
+        lines = content.splitlines(keepends=True)
+        in_project = False
+        for i, line in enumerate(lines):
+            body = line.rstrip("\r\n")
+            header = _TABLE_HEADER_RE.match(body)
+            if header:
+                in_project = header.group(1) == "project"
+                continue
+            match = _VERSION_LINE_RE.match(body) if in_project else None
+            if not match:
+                continue
+            indent, comment = match.group(1), match.group(2) or ""
+            ending = line[len(body):]
+            replacement = f'{indent}version = "{new_version}"{comment}{ending}'
+            new_content = "".join(lines[:i]) + replacement + "".join(lines[i + 1:])
+            if _project_version(new_content) == new_version:
                 break
-
-        if content == new_content:
+        else:
             # Debug: show what we're looking for
-            print(f"Debug: Content around version line:")
-            lines = content.split('\n')
-            for i, line in enumerate(lines):
+            print("Debug: Content around version line:")
+            for lineno, line in enumerate(lines, 1):
                 if 'version' in line and '=' in line:
-                    print(f"  Line {i+1}: {repr(line)}")
-            raise RuntimeError("Failed to update version in pyproject.toml")
+                    print(f"  Line {lineno}: {line.rstrip()!r}")
+            raise RuntimeError(
+                "Failed to find version in [project] table of pyproject.toml"
+            )
 
         # Write back
-        self.pyproject_path.write_text(new_content)
+        with open(self.pyproject_path, "w", newline="") as f:
+            f.write(new_content)
+        # mtime/size may not change on coarse-timestamp filesystems
+        _load_pyproject.cache_clear()
         print(f"✅ Updated version from {current_version} to {new_version} in pyproject.toml")
 
-    def run_command(self, cmd: str, check: bool = True) -> subprocess.CompletedProcess:
-        """Run a shell command."""
-        print(f"🔧 Running: {cmd}")
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+    def run_command(self, cmd: Union[List[str], str],
+                    check: bool = True) -> subprocess.CompletedProcess:
+        """Run a command. Argv lists are executed directly without a shell."""
+        display = shlex.join(cmd) if isinstance(cmd, list) else cmd
+        print(f"🔧 Running: {display}")
+        result = subprocess.run(
+            cmd, shell=isinstance(cmd, str), capture_output=True, text=True
+        )
 
         if check and result.returncode != 0:
-            print(f"❌ Command failed: {cmd}")
+            print(f"❌ Command failed: {display}")
             print(f"stdout: {result.stdout}")
             print(f"stderr: {result.stderr}")
             sys.exit(1)
 
         return result
 
-    def check_git_status(self) -> None:
-        """Check if git working directory is clean."""
-        result = self.run_command("git status --porcelain", check=False)
-        if result.stdout.strip():
+    def check_git_status(self) -> str:
+        """Check that the working directory is clean and return the current branch.
+
+        Returns an empty string when HEAD is detached.
+        """
+        result = self.run_command(
+            ["git", "status", "-b", "--porcelain=v2"], check=False
+        )
+        branch = ""
+        dirty = False
+        for line in result.stdout.splitlines():
+            if line.startswith("# branch.head "):
+                head = line[len("# branch.head "):]
+                branch = "" if head == "(detached)" else head
+            elif line and not line.startswith("#"):
+                dirty = True
+
+        if dirty:
             print("❌ Git working directory is not clean.")
             print("Please commit or stash changes before bumping version.")
             sys.exit(1)
+        return branch
 
     def check_git_branch(self) -> str:
         """Get current git branch."""
-        result = self.run_command("git branch --show-current")
+        result = self.run_command(["git", "branch", "--show-current"])
         return result.stdout.strip()
 
-    def create_version_commit(self, version: str, push: bool = True) -> None:
+    def create_version_commit(self, version: str, push: bool = True,
+                              branch: Optional[str] = None) -> None:
         """Create a commit and tag for the new version."""
+        if push and not branch:
+            raise ValueError("branch is required when push=True")
+
         # Stage the pyproject.toml change
-        self.run_command(f"git add {self.pyproject_path}")
+        self.run_command(["git", "add", str(self.pyproject_path)])
 
         # Create commit
         commit_msg = f"bump: version {version}"
-        self.run_command(f'git commit -m "{commit_msg}"')
+        self.run_command(["git", "commit", "-m", commit_msg])
         print(f"✅ Created commit: {commit_msg}")
 
         # Create tag
         tag_name = f"v{version}"
-        self.run_command(f'git tag -a {tag_name} -m "Release {version}"')
+        self.run_command(["git", "tag", "-a", tag_name, "-m", f"Release {version}"])
         print(f"✅ Created tag: {tag_name}")
 
         if push:
-            branch = self.check_git_branch()
-            self.run_command(f"git push origin {branch}")
-            self.run_command(f"git push origin {tag_name}")
-            print(f"✅ Pushed to origin/{branch} and pushed tag {tag_name}")
+            self.run_command(["git", "push", "--atomic", "origin", branch, tag_name])
+            print(f"✅ Pushed branch {branch} and tag {tag_name} atomically")
 
     def bump_and_tag(self, bump_type: str = None, version: str = None,
                      push: bool = True, dry_run: bool = False) -> str:
@@ -147,7 +214,7 @@ class VersionBumper:
             self.parse_version(version)
             new_version = version
         elif bump_type:
-            new_version = self.bump_version(bump_type)
+            new_version = self.bump_version(bump_type, current=current_version)
         else:
             raise ValueError("Must specify either bump_type or version")
 
@@ -165,13 +232,17 @@ class VersionBumper:
             return new_version
 
         # Pre-flight checks
-        self.check_git_status()
+        branch = self.check_git_status()
+        if push and not branch:
+            print("❌ Cannot push from detached HEAD.")
+            print("Check out a branch or use --no-push.")
+            sys.exit(1)
 
         # Update version
         self.set_version(new_version)
 
         # Create commit and tag
-        self.create_version_commit(new_version, push=push)
+        self.create_version_commit(new_version, push=push, branch=branch)
 
         return new_version
 
@@ -5,16 +5,18 @@ Handles building and uploading to PyPI/TestPyPI.
 """
 
 import argparse
+import os
+import shlex
 import shutil
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Union
 
 try:
-    import tomllib  # Python 3.11+
+    from bump_version import load_pyproject  # run as `python scripts/deploy.py`
 except ImportError:
-    import tomli as tomllib  # fallback for older Python
+    from scripts.bump_version import load_pyproject
 
 
 class PackageDeployer:
@@ -22,14 +24,14 @@ class PackageDeployer:
         self.project_root = project_root or Path.cwd()
         self.pyproject_path = self.project_root / "pyproject.toml"
         self.dist_dir = self.project_root / "dist"
+        self._dist_artifacts: Optional[List[Path]] = None
 
         if not self.pyproject_path.exists():
             raise FileNotFoundError(f"pyproject.toml not found at {self.pyproject_path}")
 
     def get_package_info(self) -> dict:
         """Get package information from pyproject.toml."""
-        with open(self.pyproject_path, "rb") as f:
-            data = tomllib.load(f)
+        data = load_pyproject(self.pyproject_path)
 
         project = data["project"]
         return {
@@ -38,50 +40,108 @@ class PackageDeployer:
             "description": project.get("description", ""),
         }
 
-    def run_command(self, cmd: str, check: bool = True, cwd: Path = None) -> subprocess.CompletedProcess:
-        """Run a shell command."""
+    def run_command(self, cmd: Union[List[str], str], check: bool = True,
+                    cwd: Path = None,
+                    stream: bool = False) -> subprocess.CompletedProcess:
+        """Run a command. Argv lists are executed directly without a shell.
+
+        With ``stream=True`` output is echoed line by line instead of captured.
+        """
         run_cwd = cwd or self.project_root
-        print(f"🔧 Running: {cmd} (in {run_cwd})")
+        display = shlex.join(cmd) if isinstance(cmd, list) else cmd
+        print(f"🔧 Running: {display} (in {run_cwd})")
+
+        if stream:
+            with subprocess.Popen(
+                cmd,
+                shell=isinstance(cmd, str),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                cwd=run_cwd
+            ) as proc:
+                for line in proc.stdout:
+                    sys.stdout.write(line)
+            result = subprocess.CompletedProcess(cmd, proc.returncode)
+
+            if check and result.returncode != 0:
+                print(f"❌ Command failed: {display}")
+                sys.exit(1)
+
+            return result
 
         result = subprocess.run(
             cmd,
-            shell=True,
+            shell=isinstance(cmd, str),
             capture_output=True,
             text=True,
             cwd=run_cwd
         )
 
         if check and result.returncode != 0:
-            print(f"❌ Command failed: {cmd}")
+            print(f"❌ Command failed: {display}")
             print(f"stdout: {result.stdout}")
             print(f"stderr: {result.stderr}")
             sys.exit(1)
 
         return result
 
+    def scan_dist(self) -> List[Path]:
+        """Scan dist/ once and remember the artifacts found.
+
+        Like the shell's dist/*, dotfiles are skipped; subdirectories are too.
+        """
+        if not self.dist_dir.exists():
+            self._dist_artifacts = []
+        else:
+            self._dist_artifacts = sorted(
+                path for path in self.dist_dir.glob("*")
+                if path.is_file() and not path.name.startswith(".")
+            )
+        return self._dist_artifacts
+
+    def dist_files(self) -> List[str]:
+        """Paths of the dist/ artifacts (the shell-free equivalent of dist/*)."""
+        if self._dist_artifacts is None:
+            self.scan_dist()
+        return [str(path) for path in self._dist_artifacts]
+
     def check_prerequisites(self) -> None:
         """Check if required tools are available."""
         print("🔍 Checking prerequisites...")
 
         required_commands = ["python", "twine"]
-        for cmd in required_commands:
-            result = self.run_command(f"command -v {cmd}", check=False)
-            if result.returncode != 0:
+        missing = [cmd for cmd in required_commands if shutil.which(cmd) is None]
+        if missing:
+            for cmd in missing:
                 print(f"❌ {cmd} not found. Please install it first.")
                 if cmd == "twine":
                     print("   Install with: pip install twine")
-                sys.exit(1)
+            sys.exit(1)
+
+        for cmd in required_commands:
             print(f"  ✅ {cmd} found")
 
     def check_git_status(self) -> None:
         """Verify git repository is clean and up to date."""
         print("🔍 Checking git status...")
 
+        # One status call gives both the dirty entries and ahead/behind counts
+        result = self.run_command(
+            ["git", "status", "-b", "--porcelain=v2"], check=False
+        )
+        uncommitted = []
+        ahead = 0
+        for line in result.stdout.splitlines():
+            if line.startswith("# branch.ab "):
+                ahead = int(line.split()[2].lstrip("+"))
+            elif line and not line.startswith("#"):
+                uncommitted.append(line)
+
         # Check if working directory is clean
-        result = self.run_command("git status --porcelain", check=False)
-        if result.stdout.strip():
+        if uncommitted:
             print("⚠️  Git working directory has uncommitted changes")
-            uncommitted = result.stdout.strip().split('\n')
             for line in uncommitted[:5]:  # Show first 5 changes
                 print(f"   {line}")
             if len(uncommitted) > 5:
@@ -92,44 +152,62 @@ class PackageDeployer:
                 sys.exit(1)
 
         # Check if we're ahead of remote
-        result = self.run_command("git status -b --porcelain", check=False)
-        if "ahead" in result.stdout:
+        if ahead > 0:
             print("⚠️  Local branch is ahead of remote")
             response = input("Continue without pushing? (y/N): ")
             if response.lower() != 'y':
                 sys.exit(1)
 
-    def clean_build_artifacts(self) -> None:
-        """Remove previous build artifacts."""
+    def clean_build_artifacts(self, deep_clean: bool = False) -> None:
+        """Remove previous build artifacts.
+
+        The recursive *.pyc / __pycache__ sweep only runs with ``deep_clean``.
+        """
         print("🧹 Cleaning build artifacts...")
 
-        patterns_to_clean = [
-            "dist",
-            "build",
-            "*.egg-info",
-            "**/*.pyc",
-            "**/__pycache__"
-        ]
-
-        for pattern in patterns_to_clean:
-            for path in self.project_root.glob(pattern):
-                if path.is_dir():
-                    shutil.rmtree(path)
-                    print(f"  🗑️  Removed directory: {path.name}")
-                elif path.is_file():
-                    path.unlink()
-                    print(f"  🗑️  Removed file: {path.name}")
+        for name in ("dist", "build"):
+            path = self.project_root / name
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+                print(f"  🗑️  Removed directory: {name}")
+            elif os.path.isfile(path):
+                os.unlink(path)
+                print(f"  🗑️  Removed file: {name}")
+
+        for path in self.project_root.glob("*.egg-info"):
+            if path.is_dir():
+                shutil.rmtree(path)
+                print(f"  🗑️  Removed directory: {path.name}")
+            elif path.is_file():
+                path.unlink()
+                print(f"  🗑️  Removed file: {path.name}")
+
+        if not deep_clean:
+            return
+
+        # Single traversal for *.pyc files and __pycache__ directories
+        skip_dirs = {".git", ".venv", "node_modules"}
+        for root, dirs, files in os.walk(self.project_root, topdown=True):
+            dirs[:] = [d for d in dirs if d not in skip_dirs]
+            if "__pycache__" in dirs:
+                shutil.rmtree(os.path.join(root, "__pycache__"))
+                dirs.remove("__pycache__")
+                print("  🗑️  Removed directory: __pycache__")
+            for name in files:
+                if name.endswith(".pyc"):
+                    os.unlink(os.path.join(root, name))
+                    print(f"  🗑️  Removed file: {name}")
 
     def build_package(self) -> None:
         """Build the package using python -m build."""
         print("🏗️  Building package...")
-        self.run_command("python -m build")
+        self.run_command(["python", "-m", "build"], stream=True)
 
         # Verify build artifacts exist
-        if not self.dist_dir.exists() or not list(self.dist_dir.glob("*")):
+        artifacts = self.scan_dist()
+        if not artifacts:
             raise RuntimeError("Build failed - no artifacts in dist/")
 
-        artifacts = list(self.dist_dir.glob("*"))
         print("  ✅ Build completed. Artifacts:")
         for artifact in artifacts:
             print(f"     📦 {artifact.name}")
@@ -137,7 +215,7 @@ class PackageDeployer:
     def check_package(self) -> None:
         """Check the built package using twine."""
         print("🔍 Checking package integrity...")
-        self.run_command("twine check dist/*")
+        self.run_command(["twine", "check", *self.dist_files()])
         print("  ✅ Package check passed")
 
     def upload_to_repository(self, repository: str = "pypi") -> None:
@@ -150,9 +228,12 @@ class PackageDeployer:
         print(f"📤 Uploading to {repository.upper()}...")
 
         if repository == "testpypi":
-            self.run_command("twine upload --repository testpypi dist/*")
+            self.run_command(
+                ["twine", "upload", "--repository", "testpypi", *self.dist_files()],
+                stream=True
+            )
         else:
-            self.run_command("twine upload dist/*")
+            self.run_command(["twine", "upload", *self.dist_files()], stream=True)
 
         print(f"  ✅ Successfully uploaded to {repository.upper()}")
 
@@ -164,7 +245,8 @@ class PackageDeployer:
             return f"pip install {package_name}"
 
     def deploy(self, test_only: bool = False, skip_test: bool = False,
-               skip_build: bool = False, force: bool = False) -> None:
+               skip_build: bool = False, force: bool = False,
+               deep_clean: bool = False) -> None:
         """Main deployment function."""
         package_info = self.get_package_info()
 
@@ -180,12 +262,12 @@ class PackageDeployer:
 
         # Build process
         if not skip_build:
-            self.clean_build_artifacts()
+            self.clean_build_artifacts(deep_clean=deep_clean)
             self.build_package()
             self.check_package()
         else:
             print("⏭️  Skipping build (using existing dist/)")
-            if not self.dist_dir.exists() or not list(self.dist_dir.glob("*")):
+            if not self.scan_dist():
                 raise RuntimeError("No build artifacts found in dist/")
 
         # Upload process
@@ -229,6 +311,7 @@ Examples:
   python scripts/deploy.py --skip-test    # Skip TestPyPI, go to PyPI
   python scripts/deploy.py --skip-build   # Use existing build artifacts
   python scripts/deploy.py --force        # Skip safety checks
+  python scripts/deploy.py --deep-clean   # Also remove *.pyc and __pycache__
         """
     )
 
@@ -252,6 +335,11 @@ Examples:
         action="store_true",
         help="Skip safety checks (git status, confirmations)"
     )
+    parser.add_argument(
+        "--deep-clean",
+        action="store_true",
+        help="Also remove *.pyc files and __pycache__ directories before building"
+    )
 
     args = parser.parse_args()
 
@@ -261,7 +349,8 @@ Examples:
             test_only=args.test_only,
             skip_test=args.skip_test,
             skip_build=args.skip_build,
-            force=args.force
+            force=args.force,
+            deep_clean=args.deep_clean
         )
 
     except KeyboardInterrupt:
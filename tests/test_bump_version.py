@@ -0,0 +1,172 @@
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from scripts.bump_version import VersionBumper, load_pyproject
+
+
+def write_pyproject(tmp_path: Path, text: str) -> Path:
+    path = tmp_path / "pyproject.toml"
+    path.write_bytes(text.encode())
+    return path
+
+
+def test_set_version_header_with_comment(tmp_path):
+    path = write_pyproject(tmp_path, (
+        '[project]  # metadata\n'
+        'name = "pkg"\n'
+        'version = "1.0.0"\n'
+    ))
+    VersionBumper(path).set_version("1.0.1")
+    assert 'version = "1.0.1"\n' in path.read_text()
+
+
+def test_set_version_after_nested_array(tmp_path):
+    path = write_pyproject(tmp_path, (
+        '[project]\n'
+        'name = "pkg"\n'
+        'matrix = [\n'
+        '  ["a"],\n'
+        '  ["b"],\n'
+        ']\n'
+        'version = "1.0.0"\n'
+    ))
+    VersionBumper(path).set_version("2.0.0")
+    assert 'version = "2.0.0"\n' in path.read_text()
+
+
+def test_set_version_after_multiline_string(tmp_path):
+    path = write_pyproject(tmp_path, (
+        '[project]\n'
+        'name = "pkg"\n'
+        'description = """\n'
+        '[Docs](https://example.com)\n'
+        'version = "9.9.9"\n'
+        '"""\n'
+        'version = "1.0.0"\n'
+    ))
+    VersionBumper(path).set_version("1.1.0")
+    content = path.read_text()
+    assert 'version = "9.9.9"\n' in content
+    assert 'version = "1.1.0"\n' in content
+
+
+def test_set_version_only_touches_project_table(tmp_path):
+    path = write_pyproject(tmp_path, (
+        '[tool.other]\n'
+        'version = "0.1"\n'
+        '\n'
+        '[project]\n'
+        'name = "pkg"\n'
+        'version = "1.0.0"  # bumped by script\n'
+    ))
+    VersionBumper(path).set_version("1.0.1")
+    content = path.read_text()
+    assert 'version = "0.1"\n' in content
+    assert 'version = "1.0.1"  # bumped by script\n' in content
+
+
+def test_set_version_preserves_crlf(tmp_path):
+    path = write_pyproject(
+        tmp_path, '[project]\r\nname = "pkg"\r\nversion = "1.0.0"\r\n'
+    )
+    VersionBumper(path).set_version("1.0.1")
+    assert path.read_bytes() == b'[project]\r\nname = "pkg"\r\nversion = "1.0.1"\r\n'
+
+
+def test_set_version_missing_from_project_table(tmp_path):
+    path = write_pyproject(tmp_path, '[project]\nname = "pkg"\n"version" = "1.0.0"\n')
+    with pytest.raises(RuntimeError):
+        VersionBumper(path).set_version("1.0.1")
+
+
+def test_load_pyproject_returns_independent_copies(tmp_path):
+    path = write_pyproject(tmp_path, '[project]\nname = "pkg"\nversion = "1.0.0"\n')
+    load_pyproject(path)["project"]["version"] = "mutated"
+    assert VersionBumper(path).get_current_version() == "1.0.0"
+
+
+def test_get_current_version_after_same_size_bump(tmp_path):
+    path = write_pyproject(tmp_path, '[project]\nname = "pkg"\nversion = "0.0.4"\n')
+    bumper = VersionBumper(path)
+    st = path.stat()
+    assert bumper.get_current_version() == "0.0.4"
+    bumper.set_version("0.0.5")
+    # Simulate a coarse-timestamp filesystem: same mtime and size as before
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert path.stat().st_size == st.st_size
+    assert bumper.get_current_version() == "0.0.5"
+
+
+def test_set_version_indented_header(tmp_path):
+    path = write_pyproject(tmp_path, (
+        '  [project]\n'
+        '  name = "pkg"\n'
+        '  version = "1.0.0"\n'
+    ))
+    VersionBumper(path).set_version("1.0.1")
+    assert path.read_text() == '  [project]\n  name = "pkg"\n  version = "1.0.1"\n'
+
+
+def stub_git_status(monkeypatch, bumper, stdout):
+    calls = []
+
+    def run_command(cmd, check=True):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(bumper, "run_command", run_command)
+    return calls
+
+
+@pytest.fixture
+def bumper(tmp_path):
+    return VersionBumper(
+        write_pyproject(tmp_path, '[project]\nname = "pkg"\nversion = "1.0.0"\n')
+    )
+
+
+def test_check_git_status_returns_branch(monkeypatch, bumper):
+    calls = stub_git_status(monkeypatch, bumper, (
+        "# branch.oid 0123456789abcdef\n"
+        "# branch.head main\n"
+        "# branch.upstream origin/main\n"
+        "# branch.ab +0 -0\n"
+    ))
+    assert bumper.check_git_status() == "main"
+    assert calls == [["git", "status", "-b", "--porcelain=v2"]]
+
+
+def test_check_git_status_detached_head(monkeypatch, bumper):
+    stub_git_status(monkeypatch, bumper, (
+        "# branch.oid 0123456789abcdef\n"
+        "# branch.head (detached)\n"
+    ))
+    assert bumper.check_git_status() == ""
+
+
+def test_check_git_status_dirty_exits(monkeypatch, bumper):
+    stub_git_status(monkeypatch, bumper, (
+        "# branch.oid 0123456789abcdef\n"
+        "# branch.head main\n"
+        "1 .M N... 100644 100644 100644 abc abc pyproject.toml\n"
+    ))
+    with pytest.raises(SystemExit):
+        bumper.check_git_status()
+
+
+def test_bump_and_tag_refuses_detached_head(monkeypatch, bumper):
+    calls = stub_git_status(monkeypatch, bumper, "# branch.head (detached)\n")
+    with pytest.raises(SystemExit):
+        bumper.bump_and_tag("patch")
+    assert calls == [["git", "status", "-b", "--porcelain=v2"]]
+    assert bumper.get_current_version() == "1.0.0"
+
+
+def test_create_version_commit_requires_branch_to_push(monkeypatch, bumper):
+    calls = stub_git_status(monkeypatch, bumper, "")
+    with pytest.raises(ValueError):
+        bumper.create_version_commit("1.0.1", push=True)
+    assert calls == []
@@ -0,0 +1,172 @@
+import subprocess
+
+import pytest
+
+from scripts.deploy import PackageDeployer
+
+
+@pytest.fixture
+def deployer(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[project]\nname = "pkg"\nversion = "1.0.0"\n'
+    )
+    return PackageDeployer(tmp_path)
+
+
+def stub_command(monkeypatch, deployer, stdout=""):
+    calls = []
+
+    def run_command(cmd, check=True, cwd=None, stream=False):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(deployer, "run_command", run_command)
+    return calls
+
+
+def stub_input(monkeypatch, answer="n"):
+    prompts = []
+
+    def fake_input(prompt):
+        prompts.append(prompt)
+        return answer
+
+    monkeypatch.setattr("builtins.input", fake_input)
+    return prompts
+
+
+def test_check_git_status_clean_and_up_to_date(monkeypatch, deployer):
+    calls = stub_command(monkeypatch, deployer, (
+        "# branch.oid 0123456789abcdef\n"
+        "# branch.head main\n"
+        "# branch.upstream origin/main\n"
+        "# branch.ab +0 -0\n"
+    ))
+    prompts = stub_input(monkeypatch)
+    deployer.check_git_status()
+    assert calls == [["git", "status", "-b", "--porcelain=v2"]]
+    assert prompts == []
+
+
+def test_check_git_status_no_upstream(monkeypatch, deployer):
+    stub_command(monkeypatch, deployer, (
+        "# branch.oid 0123456789abcdef\n"
+        "# branch.head feature\n"
+    ))
+    prompts = stub_input(monkeypatch)
+    deployer.check_git_status()
+    assert prompts == []
+
+
+def test_check_git_status_ahead_prompts(monkeypatch, deployer):
+    stub_command(monkeypatch, deployer, (
+        "# branch.head main\n"
+        "# branch.upstream origin/main\n"
+        "# branch.ab +2 -0\n"
+    ))
+    prompts = stub_input(monkeypatch, answer="n")
+    with pytest.raises(SystemExit):
+        deployer.check_git_status()
+    assert prompts == ["Continue without pushing? (y/N): "]
+
+
+def test_check_git_status_behind_only_does_not_prompt(monkeypatch, deployer):
+    stub_command(monkeypatch, deployer, (
+        "# branch.head main\n"
+        "# branch.upstream origin/main\n"
+        "# branch.ab +0 -3\n"
+    ))
+    prompts = stub_input(monkeypatch)
+    deployer.check_git_status()
+    assert prompts == []
+
+
+def test_check_git_status_dirty_entries(monkeypatch, deployer, capsys):
+    entries = [
+        f"1 .M N... 100644 100644 100644 abc abc file{i}.py" for i in range(7)
+    ]
+    stub_command(monkeypatch, deployer, (
+        "# branch.head main\n"
+        "# branch.ab +0 -0\n"
+        + "\n".join(entries)
+        + "\n? untracked.txt\n"
+    ))
+    prompts = stub_input(monkeypatch, answer="y")
+    deployer.check_git_status()
+    out = capsys.readouterr().out
+    assert prompts == ["Continue anyway? (y/N): "]
+    assert "file4.py" in out
+    assert "file5.py" not in out
+    assert "... and 3 more" in out
+
+
+@pytest.fixture
+def build_tree(deployer):
+    root = deployer.project_root
+    for rel in ("dist", "build", "pkg.egg-info", "src/pkg/__pycache__",
+                ".git/__pycache__", ".venv/lib/__pycache__",
+                "node_modules/x/__pycache__"):
+        (root / rel).mkdir(parents=True)
+    (root / "dist" / "pkg-1.0.0.whl").touch()
+    (root / "src/pkg/__pycache__/mod.cpython-311.pyc").touch()
+    (root / "src/pkg/stale.pyc").touch()
+    (root / "src/pkg/mod.py").touch()
+    return root
+
+
+def test_clean_build_artifacts_default_keeps_pycache(deployer, build_tree):
+    deployer.clean_build_artifacts()
+    assert not (build_tree / "dist").exists()
+    assert not (build_tree / "build").exists()
+    assert not (build_tree / "pkg.egg-info").exists()
+    assert (build_tree / "src/pkg/__pycache__").is_dir()
+    assert (build_tree / "src/pkg/stale.pyc").exists()
+
+
+def test_clean_build_artifacts_deep_clean(deployer, build_tree):
+    deployer.clean_build_artifacts(deep_clean=True)
+    assert not (build_tree / "src/pkg/__pycache__").exists()
+    assert not (build_tree / "src/pkg/stale.pyc").exists()
+    assert (build_tree / "src/pkg/mod.py").exists()
+    # Pruned directories are left untouched
+    assert (build_tree / ".git/__pycache__").is_dir()
+    assert (build_tree / ".venv/lib/__pycache__").is_dir()
+    assert (build_tree / "node_modules/x/__pycache__").is_dir()
+
+
+def test_scan_dist_skips_dotfiles_and_directories(deployer):
+    dist = deployer.dist_dir
+    (dist / "sub").mkdir(parents=True)
+    for name in (".gitignore", "pkg-1.0.0.tar.gz", "pkg-1.0.0-py3-none-any.whl"):
+        (dist / name).touch()
+    assert deployer.scan_dist() == [
+        dist / "pkg-1.0.0-py3-none-any.whl",
+        dist / "pkg-1.0.0.tar.gz",
+    ]
+    assert deployer.dist_files() == [
+        str(dist / "pkg-1.0.0-py3-none-any.whl"),
+        str(dist / "pkg-1.0.0.tar.gz"),
+    ]
+
+
+def test_dist_files_without_dist_dir(deployer):
+    assert deployer.dist_files() == []
+
+
+def test_deploy_skip_build_without_artifacts(monkeypatch, deployer):
+    monkeypatch.setattr(deployer, "check_prerequisites", lambda: None)
+    deployer.dist_dir.mkdir()
+    (deployer.dist_dir / ".gitignore").touch()
+    with pytest.raises(RuntimeError, match="No build artifacts"):
+        deployer.deploy(skip_build=True, skip_test=True, force=True)
+
+
+def test_deploy_skip_build_uploads_existing_artifacts(monkeypatch, deployer):
+    monkeypatch.setattr(deployer, "check_prerequisites", lambda: None)
+    calls = stub_command(monkeypatch, deployer)
+    deployer.dist_dir.mkdir()
+    wheel = deployer.dist_dir / "pkg-1.0.0-py3-none-any.whl"
+    wheel.touch()
+    (deployer.dist_dir / ".gitignore").touch()
+    deployer.deploy(skip_build=True, skip_test=True, force=True)
+    assert calls == [["twine", "upload", str(wheel)]]